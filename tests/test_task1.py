@@ -1,6 +1,8 @@
+import io
 import sys
+import time
 import pathlib
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pytest
 
 # --- make git-pycore-hw-03 importable without packaging ---
@@ -9,6 +11,7 @@ HW03 = ROOT / "git-pycore-hw-03"
 if str(HW03) not in sys.path:
     sys.path.insert(0, str(HW03))
 
+import task1
 from task1 import get_days_from_today
 
 
@@ -31,19 +34,241 @@ def test_future_dates_negative(days):
     assert get_days_from_today(target_date.strftime("%Y-%m-%d")) == -days
 
 
+BAD_DATES = [
+    "2021/10/09",     # wrong separator
+    "21-10-09",       # wrong year width
+    "2021-13-01",     # invalid month
+    "2021-00-10",     # invalid month
+    "2021-02-30",     # invalid day
+    "not-a-date",     # garbage
+    "",               # empty
+    "2021-1-1",       # not zero-padded
+]
+
+
+@pytest.mark.parametrize("bad", BAD_DATES)
+def test_invalid_format_raises_value_error(bad):
+    with pytest.raises(ValueError):
+        get_days_from_today(bad)
+
+
+# ------------------ batch mode: get_days_from_today_batch ------------------
+
+def test_batch_matches_single_calls():
+    pytest.importorskip("numpy")
+    today = datetime.today().date()
+    dates = [(today + timedelta(days=d)).strftime("%Y-%m-%d") for d in (-730, -1, 0, 1, 366)]
+    deltas, invalid = task1.get_days_from_today_batch(dates)
+    assert deltas.dtype.kind == "i"
+    assert not invalid.any()
+    assert deltas.tolist() == [get_days_from_today(s) for s in dates]
+
+
+def test_batch_accepts_numpy_array():
+    np = pytest.importorskip("numpy")
+    today_str = datetime.today().strftime("%Y-%m-%d")
+    deltas, invalid = task1.get_days_from_today_batch(np.array([today_str, today_str]))
+    assert deltas.tolist() == [0, 0]
+    assert invalid.tolist() == [False, False]
+
+
+def test_batch_flags_same_rows_single_call_rejects():
+    pytest.importorskip("numpy")
+    today_str = datetime.today().strftime("%Y-%m-%d")
+    dates = [today_str] + BAD_DATES + [today_str]
+    deltas, invalid = task1.get_days_from_today_batch(dates)
+    assert len(deltas) == len(dates)
+    assert invalid.tolist() == [False] + [True] * len(BAD_DATES) + [False]
+    assert deltas[0] == 0 and deltas[-1] == 0
+
+
+def test_batch_empty_input():
+    pytest.importorskip("numpy")
+    deltas, invalid = task1.get_days_from_today_batch([])
+    assert len(deltas) == 0
+    assert len(invalid) == 0
+
+
+# ------------------ fast fixed-width parser: parse_iso_date ------------------
+
+@pytest.mark.parametrize("s", ["2024-02-29", "1999-12-31", "2000-01-01", "2021-10-09"])
+def test_parse_iso_date_returns_ordinal(s):
+    assert task1.parse_iso_date(s) == datetime.strptime(s, "%Y-%m-%d").date().toordinal()
+
+
+@pytest.mark.parametrize("bad", BAD_DATES + ["2021-10-09 ", " 2021-10-09", "2023-02-29", "2021-1O-09"])
+def test_parse_iso_date_rejects_bad_dates(bad):
+    with pytest.raises(ValueError):
+        task1.parse_iso_date(bad)
+
+
+def test_get_days_from_today_uses_parse_iso_date(monkeypatch):
+    calls = []
+    real_parse = task1.parse_iso_date
+
+    def spy(s):
+        calls.append(s)
+        return real_parse(s)
+
+    monkeypatch.setattr(task1, "parse_iso_date", spy)
+    today_str = datetime.today().strftime("%Y-%m-%d")
+    assert get_days_from_today(today_str) == 0
+    assert calls == [today_str]
+
+
+def test_parse_iso_date_cache_is_bounded_and_hit():
+    task1.parse_iso_date.cache_clear()
+    for _ in range(5):
+        task1.parse_iso_date("2021-10-09")
+    info = task1.parse_iso_date.cache_info()
+    assert info.hits == 4
+    assert info.misses == 1
+    assert info.maxsize is not None
+
+
+def test_parse_iso_date_faster_than_strptime_on_repeated_dates():
+    """Microbenchmark: repeated dates should beat the strptime path."""
+    dates = [f"2021-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)] * 50
+    task1.parse_iso_date.cache_clear()
+
+    start = time.perf_counter()
+    for s in dates:
+        datetime.strptime(s, "%Y-%m-%d").date().toordinal()
+    strptime_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for s in dates:
+        task1.parse_iso_date(s)
+    parser_time = time.perf_counter() - start
+
+    assert parser_time < strptime_time, (
+        f"parse_iso_date: {parser_time:.4f}s, strptime: {strptime_time:.4f}s"
+    )
+
+
+# ------------------ business days: BusinessCalendar ------------------
+
+HOLIDAYS = [date(2024, 1, 1), date(2024, 1, 7), date(2024, 3, 8), date(2024, 12, 25)]
+
+
+def naive_business_days(start, end, holidays):
+    """Reference implementation: business days in [start, end), signed."""
+    sign = 1
+    if end < start:
+        start, end, sign = end, start, -1
+    count = 0
+    d = start
+    while d < end:
+        if d.weekday() < 5 and d not in holidays:
+            count += 1
+        d += timedelta(days=1)
+    return sign * count
+
+
 @pytest.mark.parametrize(
-    "bad",
+    "start,end",
     [
-        "2021/10/09",     # wrong separator
-        "21-10-09",       # wrong year width
-        "2021-13-01",     # invalid month
-        "2021-00-10",     # invalid month
-        "2021-02-30",     # invalid day
-        "not-a-date",     # garbage
-        "",               # empty
-        "2021-1-1",       # not zero-padded
+        (date(2024, 1, 1), date(2024, 1, 1)),
+        (date(2024, 1, 1), date(2024, 1, 8)),
+        (date(2024, 1, 5), date(2024, 1, 8)),    # Fri -> Mon
+        (date(2024, 3, 1), date(2024, 3, 31)),
+        (date(2024, 12, 31), date(2024, 1, 1)),  # reversed -> negative
+        (date(2023, 6, 15), date(2025, 6, 15)),
     ],
 )
-def test_invalid_format_raises_value_error(bad):
+def test_business_days_between_matches_naive_loop(start, end):
+    cal = task1.BusinessCalendar(2023, 2025, holidays=HOLIDAYS)
+    assert cal.business_days_between(start, end) == naive_business_days(start, end, set(HOLIDAYS))
+
+
+def test_business_days_outside_range_raises():
+    cal = task1.BusinessCalendar(2024, 2024)
     with pytest.raises(ValueError):
-        get_days_from_today(bad)
+        cal.business_days_between(date(2024, 1, 1), date(2026, 1, 1))
+
+
+def test_business_days_from_today_sign_convention():
+    today = datetime.today().date()
+    cal = task1.BusinessCalendar(today.year - 2, today.year + 2)
+    past = today - timedelta(days=30)
+    future = today + timedelta(days=30)
+    assert cal.business_days_from_today(today.strftime("%Y-%m-%d")) == 0
+    assert cal.business_days_from_today(past.strftime("%Y-%m-%d")) == naive_business_days(past, today, set())
+    assert cal.business_days_from_today(future.strftime("%Y-%m-%d")) == naive_business_days(future, today, set())
+
+
+def test_business_days_from_today_invalid_raises():
+    today = datetime.today().date()
+    cal = task1.BusinessCalendar(today.year - 1, today.year + 1)
+    for bad in BAD_DATES:
+        with pytest.raises(ValueError):
+            cal.business_days_from_today(bad)
+
+
+def test_business_days_batch_matches_scalar_calls():
+    pytest.importorskip("numpy")
+    today = datetime.today().date()
+    cal = task1.BusinessCalendar(today.year - 2, today.year + 2)
+    dates = [(today + timedelta(days=d)).strftime("%Y-%m-%d") for d in (-100, -3, 0, 3, 100)]
+    deltas, invalid = cal.business_days_from_today_batch(dates + ["2021-02-30"])
+    assert invalid.tolist() == [False] * len(dates) + [True]
+    assert deltas[: len(dates)].tolist() == [cal.business_days_from_today(s) for s in dates]
+
+
+# ------------------ streaming CLI: task1.main ------------------
+
+def _date_lines(offsets):
+    today = datetime.today().date()
+    return [(today - timedelta(days=d)).strftime("%Y-%m-%d") for d in offsets]
+
+
+def test_cli_reads_file_and_writes_date_delta(capsys, tmp_path: pathlib.Path):
+    dates = _date_lines([0, 1, -5, 365])
+    f = tmp_path / "dates.txt"
+    f.write_text("\n".join(dates) + "\n", encoding="utf-8")
+
+    rc = task1.main(["task1.py", str(f)])
+    captured = capsys.readouterr()
+    assert rc == 0
+    assert captured.out.splitlines() == [f"{d},{n}" for d, n in zip(dates, [0, 1, -5, 365])]
+    assert captured.err == ""
+
+
+def test_cli_invalid_rows_go_to_stderr(capsys, tmp_path: pathlib.Path):
+    good = _date_lines([2])[0]
+    f = tmp_path / "mixed.txt"
+    f.write_text(f"{good}\n2021-02-30\nnot-a-date\n{good}\n", encoding="utf-8")
+
+    rc = task1.main(["task1.py", str(f)])
+    captured = capsys.readouterr()
+    assert rc == 0
+    assert captured.out.splitlines() == [f"{good},2", f"{good},2"]
+    err = captured.err.splitlines()
+    assert len(err) == 2
+    assert "2021-02-30" in err[0]
+    assert "not-a-date" in err[1]
+
+
+def test_cli_reads_stdin(capsys, monkeypatch):
+    dates = _date_lines([0, 10])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(dates) + "\n"))
+    rc = task1.main(["task1.py", "-"])
+    assert rc == 0
+    assert capsys.readouterr().out.splitlines() == [f"{dates[0]},0", f"{dates[1]},10"]
+
+
+def test_cli_process_pool_keeps_order(capsys, tmp_path: pathlib.Path):
+    offsets = list(range(-500, 500))
+    dates = _date_lines(offsets)
+    f = tmp_path / "many.txt"
+    f.write_text("\n".join(dates) + "\n", encoding="utf-8")
+
+    rc = task1.main(["task1.py", str(f), "--workers", "2", "--chunk-size", "64"])
+    assert rc == 0
+    assert capsys.readouterr().out.splitlines() == [f"{d},{n}" for d, n in zip(dates, offsets)]
+
+
+def test_cli_missing_file(capsys, tmp_path: pathlib.Path):
+    rc = task1.main(["task1.py", str(tmp_path / "no_such_file.txt")])
+    assert rc == 1
+    assert "Error" in capsys.readouterr().err
@@ -1,5 +1,7 @@
 import sys
+import timeit
 import pathlib
+from itertools import combinations
 import pytest
 
 # --- make git-pycore-hw-03 importable without packaging ---
@@ -8,6 +10,7 @@ HW03 = ROOT / "git-pycore-hw-03"
 if str(HW03) not in sys.path:
     sys.path.insert(0, str(HW03))
 
+import task2
 from task2 import get_numbers_ticket
 
 
@@ -30,23 +33,23 @@ def test_full_range_quantity_equals_range_size():
     assert nums == list(range(10, 16))
 
 
-@pytest.mark.parametrize(
-    "min_v,max_v,qty",
-    [
-        (0, 10, 5),        # min < 1
-        (1, 1001, 5),      # max > 1000
-        (10, 10, 1),       # min >= max
-        (20, 10, 1),       # min > max
-        (1, 10, 0),        # qty <= 0
-        (1, 5, 10),        # qty > range size
-        ("1", 10, 5),      # wrong type
-        (1, "10", 5),      # wrong type
-        (1, 10, "5"),      # wrong type
-        (1.0, 10, 5),      # float
-        (1, 10.0, 5),      # float
-        (1, 10, 5.0),      # float
-    ],
-)
+INVALID_PARAMS = [
+    (0, 10, 5),        # min < 1
+    (1, 1001, 5),      # max > 1000
+    (10, 10, 1),       # min >= max
+    (20, 10, 1),       # min > max
+    (1, 10, 0),        # qty <= 0
+    (1, 5, 10),        # qty > range size
+    ("1", 10, 5),      # wrong type
+    (1, "10", 5),      # wrong type
+    (1, 10, "5"),      # wrong type
+    (1.0, 10, 5),      # float
+    (1, 10.0, 5),      # float
+    (1, 10, 5.0),      # float
+]
+
+
+@pytest.mark.parametrize("min_v,max_v,qty", INVALID_PARAMS)
 def test_invalid_params_return_empty(min_v, max_v, qty):
     assert get_numbers_ticket(min_v, max_v, qty) == []
 
@@ -68,3 +71,302 @@ def test_randomness_uniqueness_across_calls():
         assert len(set(nums)) == 8
         assert is_sorted_non_decreasing(nums)
         assert all(5 <= x <= 25 for x in nums)
+
+
+# ------------------ bulk mode: get_numbers_tickets ------------------
+
+def test_bulk_shape_dtype_and_row_properties():
+    np = pytest.importorskip("numpy")
+    tickets = task2.get_numbers_tickets(1, 49, 6, 1000)
+    assert isinstance(tickets, np.ndarray)
+    assert tickets.shape == (1000, 6)
+    assert tickets.dtype.kind in "iu"
+    assert tickets.flags["C_CONTIGUOUS"]
+    assert (np.diff(tickets, axis=1) > 0).all()  # sorted and unique per row
+    assert tickets.min() >= 1 and tickets.max() <= 49
+
+
+def test_bulk_full_range():
+    np = pytest.importorskip("numpy")
+    tickets = task2.get_numbers_tickets(10, 15, 6, 5)
+    assert (tickets == np.arange(10, 16)).all()
+
+
+@pytest.mark.parametrize("min_v,max_v,qty", INVALID_PARAMS)
+def test_bulk_invalid_params_return_empty(min_v, max_v, qty):
+    pytest.importorskip("numpy")
+    assert task2.get_numbers_tickets(min_v, max_v, qty, 10).size == 0
+
+
+@pytest.mark.parametrize("count", [0, -1, 2.0, "3"])
+def test_bulk_invalid_count_returns_empty(count):
+    pytest.importorskip("numpy")
+    assert task2.get_numbers_tickets(1, 49, 6, count).size == 0
+
+
+# ------------------ seedable streams: TicketGenerator ------------------
+
+def test_generator_is_reproducible_for_seed():
+    a = task2.TicketGenerator(seed=42)
+    b = task2.TicketGenerator(seed=42)
+    assert [a.ticket(1, 49, 6) for _ in range(20)] == [b.ticket(1, 49, 6) for _ in range(20)]
+
+
+def test_generator_ticket_respects_contract():
+    gen = task2.TicketGenerator(seed=1)
+    nums = gen.ticket(5, 25, 8)
+    assert len(nums) == 8
+    assert len(set(nums)) == 8
+    assert is_sorted_non_decreasing(nums)
+    assert gen.ticket(10, 15, 6) == list(range(10, 16))
+    assert gen.ticket(1, 10, 5.0) == []
+
+
+def test_spawned_children_are_independent_and_deterministic():
+    children = task2.TicketGenerator(seed=7).spawn(4)
+    again = task2.TicketGenerator(seed=7).spawn(4)
+    streams = [[c.ticket(1, 1000, 10) for _ in range(5)] for c in children]
+    assert streams == [[c.ticket(1, 1000, 10) for _ in range(5)] for c in again]
+    assert len({repr(s) for s in streams}) == 4
+
+
+def test_parallel_driver_same_output_for_seed_and_workers():
+    np = pytest.importorskip("numpy")
+    a = task2.generate_tickets_parallel(1, 49, 6, 2000, seed=123, workers=2)
+    b = task2.generate_tickets_parallel(1, 49, 6, 2000, seed=123, workers=2)
+    assert a.shape == (2000, 6)
+    assert np.array_equal(a, b)
+    assert (np.diff(a, axis=1) > 0).all()
+    assert a.min() >= 1 and a.max() <= 49
+
+
+def test_parallel_driver_seed_changes_output():
+    np = pytest.importorskip("numpy")
+    a = task2.generate_tickets_parallel(1, 1000, 6, 100, seed=1, workers=2)
+    b = task2.generate_tickets_parallel(1, 1000, 6, 100, seed=2, workers=2)
+    assert not np.array_equal(a, b)
+
+
+# ------------------ duplicate detection: TicketRegistry ------------------
+
+def test_registry_keys_are_dense_combinatorial_ranks():
+    reg = task2.TicketRegistry(1, 6, 3)
+    keys = [reg.encode(list(c)) for c in combinations(range(1, 7), 3)]
+    assert sorted(keys) == list(range(20))  # C(6, 3) == 20, no collisions
+
+
+def test_registry_reports_duplicates_across_batches():
+    reg = task2.TicketRegistry(1, 49, 6)
+    first = [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]]
+    assert reg.add_batch(first) == []
+    second = [[13, 14, 15, 16, 17, 18], [1, 2, 3, 4, 5, 6], [13, 14, 15, 16, 17, 18]]
+    assert reg.add_batch(second) == [1, 2]  # one old, one repeated within batch
+    assert len(reg) == 3
+    assert [7, 8, 9, 10, 11, 12] in reg
+    assert [7, 8, 9, 10, 11, 13] not in reg
+
+
+def test_registry_accepts_generated_tickets():
+    reg = task2.TicketRegistry(5, 25, 8)
+    tickets = [get_numbers_ticket(5, 25, 8) for _ in range(200)]
+    dups = reg.add_batch(tickets)
+    seen = set()
+    expected = []
+    for i, t in enumerate(tickets):
+        if tuple(t) in seen:
+            expected.append(i)
+        seen.add(tuple(t))
+    assert dups == expected
+    assert len(reg) == len(seen)
+
+
+def test_registry_rejects_invalid_parameters():
+    with pytest.raises(ValueError):
+        task2.TicketRegistry(0, 10, 5)
+    with pytest.raises(ValueError):
+        task2.TicketRegistry(1, 5, 10)
+
+
+def test_registry_persists_to_file(tmp_path: pathlib.Path):
+    path = tmp_path / "issued.bin"
+    reg = task2.TicketRegistry(1, 49, 6, path=str(path))
+    reg.add_batch([[1, 2, 3, 4, 5, 6]])
+    reg.close()
+
+    reopened = task2.TicketRegistry(1, 49, 6, path=str(path))
+    assert reopened.add_batch([[1, 2, 3, 4, 5, 6], [2, 3, 4, 5, 6, 7]]) == [0]
+    reopened.close()
+
+
+# ------------------ draw matching: DrawMatcher ------------------
+
+def test_matcher_match_counts_equal_set_intersection():
+    tickets = [get_numbers_ticket(1, 49, 6) for _ in range(500)]
+    draw = get_numbers_ticket(1, 49, 6)
+    matcher = task2.DrawMatcher(1, 49)
+    matcher.add(tickets)
+    counts = matcher.matches(draw)
+    assert list(counts) == [len(set(t) & set(draw)) for t in tickets]
+
+
+def test_matcher_tiers_and_winner_indices():
+    tickets = [
+        [1, 2, 3, 4, 5, 6],     # 6 matches
+        [1, 2, 3, 4, 5, 7],     # 5 matches
+        [1, 2, 3, 40, 41, 42],  # 3 matches
+        [10, 11, 12, 13, 14, 15],  # 0 matches
+        [1, 2, 3, 4, 5, 8],     # 5 matches
+    ]
+    matcher = task2.DrawMatcher(1, 49)
+    matcher.add(tickets)
+    result = matcher.score([1, 2, 3, 4, 5, 6], tiers=(3, 4, 5, 6))
+    assert result.counts == {3: 1, 4: 0, 5: 2, 6: 1}
+    assert {k: list(v) for k, v in result.winners.items()} == {3: [2], 4: [], 5: [1, 4], 6: [0]}
+
+
+def test_matcher_supports_full_1000_range():
+    tickets = [get_numbers_ticket(1, 1000, 20) for _ in range(200)]
+    draw = tickets[17]
+    matcher = task2.DrawMatcher(1, 1000)
+    matcher.add(tickets)
+    counts = list(matcher.matches(draw))
+    assert counts[17] == 20
+    assert counts == [len(set(t) & set(draw)) for t in tickets]
+
+
+def test_matcher_add_is_incremental():
+    matcher = task2.DrawMatcher(1, 49)
+    matcher.add([[1, 2, 3, 4, 5, 6]])
+    matcher.add([[7, 8, 9, 10, 11, 12]])
+    assert len(matcher) == 2
+    assert list(matcher.matches([1, 2, 3, 7, 8, 9])) == [3, 3]
+
+
+# ------------------ samplers and dispatcher ------------------
+
+SAMPLERS = ["sample_floyd", "sample_fisher_yates", "sample_rejection"]
+PARAM_GRID = [
+    (10, 15, 6),     # full range, as in test_full_range_quantity_equals_range_size
+    (1, 49, 6),
+    (5, 25, 8),
+    (1, 1000, 1),
+    (1, 1000, 3),
+    (1, 1000, 500),
+    (1, 1000, 999),
+    (1, 1000, 1000),
+]
+
+
+@pytest.mark.parametrize("name", SAMPLERS)
+@pytest.mark.parametrize("min_v,max_v,qty", PARAM_GRID)
+def test_sampler_returns_unique_in_range(name, min_v, max_v, qty):
+    sampler = getattr(task2, name)
+    nums = sampler(min_v, max_v, qty)
+    assert len(nums) == qty
+    assert len(set(nums)) == qty
+    assert all(min_v <= x <= max_v for x in nums)
+
+
+@pytest.mark.parametrize("min_v,max_v,qty", PARAM_GRID)
+def test_choose_sampler_returns_known_sampler(min_v, max_v, qty):
+    chosen = task2.choose_sampler(max_v - min_v + 1, qty)
+    assert chosen in [getattr(task2, name) for name in SAMPLERS]
+
+
+def test_get_numbers_ticket_uses_dispatcher(monkeypatch):
+    calls = []
+    real_choose = task2.choose_sampler
+
+    def spy(range_size, quantity):
+        calls.append((range_size, quantity))
+        return real_choose(range_size, quantity)
+
+    monkeypatch.setattr(task2, "choose_sampler", spy)
+    assert get_numbers_ticket(10, 15, 6) == list(range(10, 16))
+    assert calls == [(6, 6)]
+
+
+def test_invalid_params_skip_dispatcher(monkeypatch):
+    monkeypatch.setattr(task2, "choose_sampler", lambda *a: pytest.fail("dispatcher called"))
+    assert get_numbers_ticket(1, 5, 10) == []
+
+
+# Sweep qty/range ratios across the whole 1..1000 window.
+BENCH_RANGE_SIZES = [6, 49, 250, 1000]
+BENCH_RATIOS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+BENCH_GRID = sorted({
+    (1, size, max(1, round(size * ratio)))
+    for size in BENCH_RANGE_SIZES
+    for ratio in BENCH_RATIOS
+} | {(10, 15, 6)})
+
+
+def _time_sampler(sampler, min_v, max_v, qty, number=50, repeat=5):
+    # Best of several repeats filters out scheduler noise.
+    return min(timeit.repeat(lambda: sampler(min_v, max_v, qty), number=number, repeat=repeat))
+
+
+@pytest.mark.parametrize("min_v,max_v,qty", BENCH_GRID)
+def test_benchmark_dispatcher_choice_is_competitive(min_v, max_v, qty):
+    """Benchmark: the chosen sampler is never far behind the fastest one."""
+    timings = {name: _time_sampler(getattr(task2, name), min_v, max_v, qty) for name in SAMPLERS}
+    chosen = task2.choose_sampler(max_v - min_v + 1, qty).__name__
+    best = min(timings.values())
+    assert timings[chosen] <= best * 3, f"chosen={chosen}, timings={timings}"
+
+
+# ------------------ weighted draws: get_weighted_numbers_ticket ------------------
+
+def test_weighted_ticket_basic_properties():
+    weights = [1.0] * 49
+    nums = task2.get_weighted_numbers_ticket(1, 49, 6, weights)
+    assert len(nums) == 6
+    assert len(set(nums)) == 6
+    assert is_sorted_non_decreasing(nums)
+    assert all(1 <= x <= 49 for x in nums)
+
+
+def test_weighted_zero_weight_never_drawn():
+    weights = [0.0 if x % 2 else 1.0 for x in range(1, 21)]  # only even numbers
+    for _ in range(50):
+        nums = task2.get_weighted_numbers_ticket(1, 20, 5, weights)
+        assert all(x % 2 == 0 for x in nums)
+
+
+def test_weighted_full_support_equals_range():
+    assert task2.get_weighted_numbers_ticket(10, 15, 6, [1, 2, 3, 4, 5, 6]) == list(range(10, 16))
+
+
+def test_weighted_heavy_number_is_favoured():
+    weights = [1.0] * 10
+    weights[0] = 100.0
+    hits = sum(1 in task2.get_weighted_numbers_ticket(1, 10, 1, weights) for _ in range(500))
+    assert hits > 400  # expected ~0.92 * 500
+
+
+@pytest.mark.parametrize(
+    "min_v,max_v,qty,weights",
+    [
+        (0, 10, 5, [1] * 11),
+        (1, 1001, 5, [1] * 1001),
+        (1, 10, 5.0, [1] * 10),
+        (1, 10, 5, [1] * 9),              # wrong length
+        (1, 10, 5, [1] * 9 + [-1]),       # negative weight
+        (1, 10, 5, [1, 1, 1, 1] + [0] * 6),  # fewer positive weights than qty
+    ],
+)
+def test_weighted_invalid_params_return_empty(min_v, max_v, qty, weights):
+    assert task2.get_weighted_numbers_ticket(min_v, max_v, qty, weights) == []
+
+
+def test_alias_table_cached_per_weight_vector():
+    a = task2.build_alias_table((1.0, 2.0, 3.0))
+    b = task2.build_alias_table((1.0, 2.0, 3.0))
+    c = task2.build_alias_table((3.0, 2.0, 1.0))
+    assert a is b
+    assert a is not c
+
+
+def test_unweighted_path_does_not_build_alias_table(monkeypatch):
+    monkeypatch.setattr(task2, "build_alias_table", lambda *a: pytest.fail("alias table built"))
+    assert len(get_numbers_ticket(1, 49, 6)) == 6
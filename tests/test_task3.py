@@ -1,5 +1,8 @@
+import csv
 import sys
+from collections import Counter
 import re
+import time
 import pathlib
 import pytest
 
@@ -9,6 +12,7 @@ HW03 = ROOT / "git-pycore-hw-03"
 if str(HW03) not in sys.path:
     sys.path.insert(0, str(HW03))
 
+import task3
 from task3 import normalize_phone
 
 
@@ -16,18 +20,20 @@ def only_plus_digits(s: str) -> bool:
     return re.fullmatch(r"\+\d+", s) is not None
 
 
+RAW_NUMBERS = [
+    "067\t123 4567",
+    "(095) 234-5678\n",
+    "+380 44 123 4567",
+    "380501234567",
+    "    +38(050)123-32-34",
+    "     0503451234",
+    "(050)8889900",
+    "38050-111-22-22",
+    "38050 111 22 11   ",
+]
+
+
 def test_examples_from_prompt():
-    raw_numbers = [
-        "067\t123 4567",
-        "(095) 234-5678\n",
-        "+380 44 123 4567",
-        "380501234567",
-        "    +38(050)123-32-34",
-        "     0503451234",
-        "(050)8889900",
-        "38050-111-22-22",
-        "38050 111 22 11   ",
-    ]
     expected = [
         "+380671234567",
         "+380952345678",
@@ -39,7 +45,7 @@ def test_examples_from_prompt():
         "+380501112222",
         "+380501112211",
     ]
-    assert [normalize_phone(n) for n in raw_numbers] == expected
+    assert [normalize_phone(n) for n in RAW_NUMBERS] == expected
 
 
 @pytest.mark.parametrize(
@@ -73,3 +79,302 @@ def test_only_plus_and_digits_in_output():
     for s in samples:
         out = normalize_phone(s)
         assert only_plus_digits(out), f"Output contains invalid characters: {out}"
+
+
+# ------------------ batch mode: normalize_phones ------------------
+
+RAW_SAMPLES = RAW_NUMBERS + ["++380501234567", "  (044) 321-00-00 "]
+
+
+def test_batch_matches_single_calls():
+    assert task3.normalize_phones(RAW_SAMPLES) == [normalize_phone(n) for n in RAW_SAMPLES]
+
+
+def test_batch_accepts_any_iterable():
+    assert task3.normalize_phones(iter(RAW_SAMPLES[:3])) == [normalize_phone(n) for n in RAW_SAMPLES[:3]]
+    assert task3.normalize_phones([]) == []
+
+
+@pytest.mark.parametrize("bad", [None, 12345, 38.0, [], {}])
+def test_batch_non_string_raises(bad):
+    with pytest.raises(ValueError):
+        task3.normalize_phones(["0501234567", bad])  # type: ignore[list-item]
+
+
+def test_batch_throughput_vs_single_calls(record_property):
+    """Throughput: the batch API should beat a loop of single calls."""
+    numbers = RAW_SAMPLES * 2000
+
+    start = time.perf_counter()
+    single = [normalize_phone(n) for n in numbers]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = task3.normalize_phones(numbers)
+    batch_time = time.perf_counter() - start
+
+    record_property("normalize_phones_per_sec", round(len(numbers) / batch_time))
+    record_property("normalize_phone_per_sec", round(len(numbers) / single_time))
+
+    assert batch == single
+    assert batch_time < single_time, (
+        f"normalize_phones: {len(numbers) / batch_time:,.0f}/s, "
+        f"normalize_phone: {len(numbers) / single_time:,.0f}/s"
+    )
+
+
+# ------------------ opt-in memoization: CachedNormalizer ------------------
+
+def test_cached_normalizer_matches_normalize_phone():
+    norm = task3.CachedNormalizer(maxsize=128)
+    assert [norm(n) for n in RAW_SAMPLES] == [normalize_phone(n) for n in RAW_SAMPLES]
+
+
+def test_cached_normalizer_counts_hits_and_misses():
+    norm = task3.CachedNormalizer(maxsize=128)
+    for _ in range(3):
+        norm("067 123 4567")
+    norm("0501234567")
+    assert (norm.hits, norm.misses, norm.evictions) == (2, 2, 0)
+    assert norm.hit_rate == pytest.approx(0.5)
+    assert len(norm) == 2
+
+
+def test_cached_normalizer_lru_eviction():
+    norm = task3.CachedNormalizer(maxsize=2)
+    norm("0501111111")
+    norm("0502222222")
+    norm("0501111111")   # refresh -> 0502222222 is now least recent
+    norm("0503333333")   # evicts 0502222222
+    assert norm.evictions == 1
+    norm("0501111111")
+    assert norm.hits == 2
+    norm("0502222222")
+    assert norm.misses == 4
+
+
+def test_cached_normalizer_clear_resets_entries_and_counters():
+    norm = task3.CachedNormalizer(maxsize=8)
+    norm("0501234567")
+    norm("0501234567")
+    norm.clear()
+    assert len(norm) == 0
+    assert (norm.hits, norm.misses, norm.evictions) == (0, 0, 0)
+    assert norm.hit_rate == 0.0
+
+
+@pytest.mark.parametrize("bad", [None, 12345, 38.0, [], {}])
+def test_cached_normalizer_non_string_raises(bad):
+    norm = task3.CachedNormalizer(maxsize=8)
+    with pytest.raises(ValueError):
+        norm(bad)  # type: ignore[arg-type]
+    assert len(norm) == 0
+
+
+@pytest.mark.parametrize("size", [0, -1, 1.5, "10"])
+def test_cached_normalizer_invalid_size(size):
+    with pytest.raises(ValueError):
+        task3.CachedNormalizer(maxsize=size)  # type: ignore[arg-type]
+
+
+# ------------------ CSV pipeline: normalize_csv ------------------
+
+def write_csv(p: pathlib.Path, rows) -> pathlib.Path:
+    with p.open("w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(rows)
+    return p
+
+
+def read_csv(p: pathlib.Path):
+    with p.open(encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_normalize_csv_rewrites_column_in_order(tmp_path: pathlib.Path):
+    rows = [["name", "phone", "city"]] + [[f"user{i}", raw, "Kyiv"] for i, raw in enumerate(RAW_SAMPLES)]
+    src = write_csv(tmp_path / "crm.csv", rows)
+    dst = tmp_path / "out.csv"
+    rej = tmp_path / "reject.csv"
+
+    ok, rejected = task3.normalize_csv(str(src), "phone", str(dst), str(rej))
+    assert (ok, rejected) == (len(RAW_SAMPLES), 0)
+    out = read_csv(dst)
+    assert out[0] == ["name", "phone", "city"]
+    assert out[1:] == [[f"user{i}", normalize_phone(raw), "Kyiv"] for i, raw in enumerate(RAW_SAMPLES)]
+
+
+def test_normalize_csv_parallel_chunks_keep_row_order(tmp_path: pathlib.Path):
+    rows = [["id", "phone"]] + [[str(i), f"050{i:07d}"] for i in range(5000)]
+    src = write_csv(tmp_path / "big.csv", rows)
+    dst = tmp_path / "out.csv"
+
+    ok, rejected = task3.normalize_csv(
+        str(src), "phone", str(dst), str(tmp_path / "reject.csv"), workers=2, chunk_size=4096
+    )
+    assert (ok, rejected) == (5000, 0)
+    assert read_csv(dst)[1:] == [[str(i), f"+38050{i:07d}"] for i in range(5000)]
+
+
+def test_normalize_csv_rejects_malformed_rows(tmp_path: pathlib.Path):
+    rows = [["name", "phone"], ["ok", "0501234567"], ["short"], ["ok2", "(044) 321-00-00"]]
+    src = write_csv(tmp_path / "crm.csv", rows)
+    dst = tmp_path / "out.csv"
+    rej = tmp_path / "reject.csv"
+
+    ok, rejected = task3.normalize_csv(str(src), "phone", str(dst), str(rej))
+    assert (ok, rejected) == (2, 1)
+    assert read_csv(dst)[1:] == [["ok", "+380501234567"], ["ok2", "+380443210000"]]
+    assert read_csv(rej) == [["name", "phone"], ["short"]]
+
+
+def test_normalize_csv_unknown_column_raises(tmp_path: pathlib.Path):
+    src = write_csv(tmp_path / "crm.csv", [["name", "tel"], ["a", "0501234567"]])
+    with pytest.raises(ValueError):
+        task3.normalize_csv(str(src), "phone", str(tmp_path / "o.csv"), str(tmp_path / "r.csv"))
+
+
+# ------------------ multi-country rules: PhoneRules ------------------
+
+def make_rules():
+    return task3.PhoneRules([
+        task3.CountryRule("UA", country_code="380", trunk_prefix="0", min_len=12, max_len=12),
+        task3.CountryRule("PL", country_code="48", trunk_prefix="", min_len=11, max_len=11),
+        task3.CountryRule("DE", country_code="49", trunk_prefix="0", min_len=10, max_len=15),
+        task3.CountryRule("MD", country_code="373", trunk_prefix="0", min_len=11, max_len=11),
+    ])
+
+
+def test_default_rules_keep_ukrainian_behaviour():
+    rules = task3.DEFAULT_RULES
+    assert [rules.normalize(n) for n in RAW_SAMPLES] == [normalize_phone(n) for n in RAW_SAMPLES]
+
+
+@pytest.mark.parametrize(
+    "raw,country,expected",
+    [
+        ("+48 123 456 789", "PL", "+48123456789"),
+        ("48-123-456-789", "PL", "+48123456789"),
+        ("123 456 789", "PL", "+48123456789"),
+        ("030 1234567", "DE", "+49301234567"),
+        ("+49 (30) 1234567", "DE", "+49301234567"),
+        ("022 123456", "MD", "+37322123456"),
+        ("+373 22 123456", "MD", "+37322123456"),
+        ("067 123 4567", "UA", "+380671234567"),
+    ],
+)
+def test_rules_normalize_per_country(raw, country, expected):
+    assert make_rules().normalize(raw, country=country) == expected
+
+
+def test_rules_detect_country_from_international_prefix():
+    rules = make_rules()
+    assert rules.normalize("+48 123 456 789") == "+48123456789"
+    assert rules.normalize("+373 22 123456") == "+37322123456"
+
+
+@pytest.mark.parametrize("raw,country", [("+48 123 45", "PL"), ("0221234567890", "MD")])
+def test_rules_length_limits_raise(raw, country):
+    with pytest.raises(ValueError):
+        make_rules().normalize(raw, country=country)
+
+
+def test_rules_unknown_country_and_non_string_raise():
+    rules = make_rules()
+    with pytest.raises(ValueError):
+        rules.normalize("0501234567", country="XX")
+    with pytest.raises(ValueError):
+        rules.normalize(None)  # type: ignore[arg-type]
+
+
+def test_rules_throughput_benchmark():
+    """Throughput: the compiled single-pass engine keeps up with normalize_phone."""
+    numbers = RAW_SAMPLES * 2000
+    rules = task3.DEFAULT_RULES
+
+    start = time.perf_counter()
+    for n in numbers:
+        normalize_phone(n)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for n in numbers:
+        rules.normalize(n)
+    rules_time = time.perf_counter() - start
+
+    assert rules_time < single_time * 2, (
+        f"PhoneRules: {len(numbers) / rules_time:,.0f}/s, "
+        f"normalize_phone: {len(numbers) / single_time:,.0f}/s"
+    )
+
+
+# ------------------ compact encoding: encode_phone / PhoneArray ------------------
+
+@pytest.mark.parametrize(
+    "number",
+    ["+380501234567", "+48123456789", "+37322123456", "+1", "+999999999999999"],
+)
+def test_encode_decode_round_trip(number):
+    code = task3.encode_phone(number)
+    assert isinstance(code, int)
+    assert 0 <= code < 2 ** 64
+    assert task3.decode_phone(code) == number
+
+
+@pytest.mark.parametrize("bad", ["380501234567", "+", "+0501234567", "+1234567890123456", "+38a", None])
+def test_encode_rejects_non_e164(bad):
+    with pytest.raises(ValueError):
+        task3.encode_phone(bad)  # type: ignore[arg-type]
+
+
+def test_phone_array_bulk_store_and_lookup():
+    normalized = task3.normalize_phones(RAW_SAMPLES)
+    arr = task3.PhoneArray()
+    arr.extend(normalized)
+    assert len(arr) == len(normalized)
+    assert list(arr) == normalized
+    assert "+380501234567" in arr
+    assert "+380509999999" not in arr
+    assert arr.contains_many(["+380501234567", "+380509999999"]) == [True, False]
+
+
+def test_phone_array_memory_benchmark():
+    """Memory: packed storage must be far below CPython str objects."""
+    numbers = [f"+38050{i:07d}" for i in range(100_000)]
+    arr = task3.PhoneArray(numbers)
+    str_bytes = sum(sys.getsizeof(n) for n in numbers)
+    assert arr.nbytes <= 8 * len(numbers) + 1024
+    assert arr.nbytes * 5 < str_bytes, f"PhoneArray: {arr.nbytes} B, str: {str_bytes} B"
+
+
+# ------------------ external-sort dedup: dedup_phones ------------------
+
+def test_dedup_matches_counter_in_memory():
+    raw = RAW_SAMPLES * 3 + ["0671234567"]
+    expected = sorted(Counter(normalize_phone(n) for n in raw).items())
+    assert list(task3.dedup_phones(raw)) == expected
+
+
+def test_dedup_spills_runs_and_merges(tmp_path: pathlib.Path):
+    raw = [f"(050) {i % 997:07d}" for i in range(10_000)]
+    expected = sorted(Counter(normalize_phone(n) for n in raw).items())
+
+    result = list(task3.dedup_phones(raw, max_items=256, tmp_dir=str(tmp_path)))
+    assert result == expected
+    assert list(tmp_path.iterdir()) == []  # spilled runs are cleaned up
+
+
+@pytest.mark.parametrize("limit", [0, -5, 1.5])
+def test_dedup_invalid_limit(limit):
+    with pytest.raises(ValueError):
+        list(task3.dedup_phones(RAW_SAMPLES, max_items=limit))
+
+
+def test_dedup_cli(capsys, tmp_path: pathlib.Path):
+    a = tmp_path / "a.txt"
+    b = tmp_path / "b.txt"
+    a.write_text("067 123 4567\n0501234567\n", encoding="utf-8")
+    b.write_text("+380671234567\n\n", encoding="utf-8")
+
+    rc = task3.dedup_main(["task3.py", str(a), str(b), "--max-items", "1"])
+    assert rc == 0
+    assert capsys.readouterr().out.splitlines() == ["+380501234567,1", "+380671234567,2"]
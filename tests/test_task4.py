@@ -1,4 +1,5 @@
 import sys
+import json
 import pathlib
 from datetime import date as _real_date
 
@@ -109,3 +110,185 @@ def test_invalid_records_are_skipped(monkeypatch):
         {"name": "Valid1", "congratulation_date": "2024.01.23"},
         {"name": "Valid2", "congratulation_date": "2024.01.29"},
     ]
+
+
+# ------------------ bucket index: BirthdayIndex ------------------
+
+INDEX_USERS = [
+    {"name": "A", "birthday": "1990.01.23"},
+    {"name": "B", "birthday": "1990.01.27"},
+    {"name": "C", "birthday": "1990.01.28"},
+    {"name": "D", "birthday": "1992.01.22"},
+    {"name": "E", "birthday": "1980.01.30"},
+    {"name": "F", "birthday": "1991.01.02"},
+    {"name": "G", "birthday": "2000.02.29"},
+    {"name": "H", "birthday": "1985.12.31"},
+    {"name": "BadFmt", "birthday": "2000-01-23"},
+    {"name": "NoBday"},
+    {"birthday": "2001.01.23"},
+]
+
+
+@pytest.mark.parametrize(
+    "today",
+    [(2024, 1, 23), (2024, 12, 30), (2024, 12, 27), (2024, 2, 25), (2023, 2, 25), (2024, 6, 1)],
+)
+def test_index_matches_get_upcoming_birthdays(monkeypatch, today):
+    set_today(monkeypatch, *today)
+    index = task4.BirthdayIndex(INDEX_USERS)
+    assert index.upcoming() == task4.get_upcoming_birthdays(INDEX_USERS)
+
+
+def test_index_visits_at_most_8_buckets(monkeypatch):
+    set_today(monkeypatch, 2024, 1, 23)
+    users = [{"name": f"U{i}", "birthday": f"1990.{m:02d}.{d:02d}"}
+             for i, (m, d) in enumerate((m, d) for m in range(1, 13) for d in range(1, 29))]
+    index = task4.BirthdayIndex(users)
+    out = index.upcoming()
+    assert out == task4.get_upcoming_birthdays(users)
+    assert index.buckets_visited <= 8
+
+
+def test_index_is_built_once(monkeypatch):
+    set_today(monkeypatch, 2024, 1, 23)
+    users = [{"name": "A", "birthday": "1990.01.23"}]
+    index = task4.BirthdayIndex(users)
+    users.append({"name": "Late", "birthday": "1990.01.24"})  # not seen by the index
+    assert index.upcoming() == [{"name": "A", "congratulation_date": "2024.01.23"}]
+
+
+# ------------------ vectorized path: get_upcoming_birthdays_vectorized ------------------
+
+@pytest.mark.parametrize(
+    "today",
+    [(2024, 1, 23), (2024, 12, 30), (2024, 12, 27), (2024, 2, 25), (2023, 2, 25), (2024, 6, 1)],
+)
+def test_vectorized_matches_loop_for_7_days(monkeypatch, today):
+    pytest.importorskip("numpy")
+    set_today(monkeypatch, *today)
+    assert task4.get_upcoming_birthdays_vectorized(INDEX_USERS) == task4.get_upcoming_birthdays(INDEX_USERS)
+
+
+def test_vectorized_custom_horizon(monkeypatch):
+    pytest.importorskip("numpy")
+    set_today(monkeypatch, 2024, 1, 23)
+    users = [
+        {"name": "Now", "birthday": "1990.01.23"},
+        {"name": "Week", "birthday": "1990.01.30"},
+        {"name": "Month", "birthday": "1990.02.20"},   # Tue, 28 days ahead
+        {"name": "Later", "birthday": "1990.02.21"},   # 29 days ahead
+    ]
+    assert task4.get_upcoming_birthdays_vectorized(users, days=0) == [
+        {"name": "Now", "congratulation_date": "2024.01.23"},
+    ]
+    assert [u["name"] for u in task4.get_upcoming_birthdays_vectorized(users, days=28)] == [
+        "Now", "Week", "Month",
+    ]
+
+
+def test_vectorized_skips_invalid_records(monkeypatch):
+    pytest.importorskip("numpy")
+    set_today(monkeypatch, 2024, 1, 23)
+    users = [
+        {"name": "Valid1", "birthday": "2000.01.23"},
+        {"name": "BadFmt", "birthday": "2000-01-23"},
+        {"name": "BadDay", "birthday": "2000.02.30"},
+        {"name": "NoBday"},
+        {"birthday": "2001.01.23"},
+        {"name": "Valid2", "birthday": "1999.01.27"},
+    ]
+    assert task4.get_upcoming_birthdays_vectorized(users) == [
+        {"name": "Valid1", "congratulation_date": "2024.01.23"},
+        {"name": "Valid2", "congratulation_date": "2024.01.29"},
+    ]
+
+
+def test_vectorized_empty_input(monkeypatch):
+    pytest.importorskip("numpy")
+    set_today(monkeypatch, 2024, 1, 23)
+    assert task4.get_upcoming_birthdays_vectorized([]) == []
+
+
+# ------------------ streaming: iter_upcoming_birthdays / main ------------------
+
+def test_stream_yields_sorted_results(monkeypatch):
+    set_today(monkeypatch, 2024, 1, 23)
+    gen = task4.iter_upcoming_birthdays(iter(INDEX_USERS))
+    assert iter(gen) is gen
+    assert list(gen) == task4.get_upcoming_birthdays(INDEX_USERS)
+
+
+def test_stream_accepts_generator_of_records(monkeypatch):
+    set_today(monkeypatch, 2024, 12, 30)
+    records = ({"name": f"U{i}", "birthday": "1991.01.02" if i % 1000 == 0 else "1991.06.15"}
+               for i in range(10_000))
+    out = list(task4.iter_upcoming_birthdays(records))
+    assert out == [{"name": f"U{i}", "congratulation_date": "2025.01.02"} for i in range(0, 10_000, 1000)]
+
+
+def test_cli_reads_jsonl(capsys, monkeypatch, tmp_path: pathlib.Path):
+    set_today(monkeypatch, 2024, 1, 23)
+    f = tmp_path / "users.jsonl"
+    lines = [json.dumps(u) for u in INDEX_USERS] + ["not json", ""]
+    f.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    rc = task4.main(["task4.py", str(f)])
+    out = [json.loads(ln) for ln in capsys.readouterr().out.splitlines()]
+    assert rc == 0
+    assert out == task4.get_upcoming_birthdays(INDEX_USERS)
+
+
+def test_cli_missing_file(capsys, tmp_path: pathlib.Path):
+    rc = task4.main(["task4.py", str(tmp_path / "no_such_file.jsonl")])
+    assert rc == 1
+    assert "Error" in capsys.readouterr().err
+
+
+def test_cli_usage_without_arguments(capsys):
+    rc = task4.main(["task4.py"])
+    assert rc == 2
+    assert "Usage:" in capsys.readouterr().out
+
+
+# ------------------ daily memoization: BirthdayDigest ------------------
+
+def test_digest_hits_within_same_day(monkeypatch):
+    set_today(monkeypatch, 2024, 1, 23)
+    digest = task4.BirthdayDigest(INDEX_USERS)
+    first = digest.get()
+    second = digest.get()
+    assert first == second == task4.get_upcoming_birthdays(INDEX_USERS)
+    assert (digest.hits, digest.misses) == (1, 1)
+
+
+def test_digest_recomputes_on_date_rollover(monkeypatch):
+    users = [{"name": "A", "birthday": "1990.01.30"}]
+    set_today(monkeypatch, 2024, 1, 22)
+    digest = task4.BirthdayDigest(users)
+    assert digest.get() == []
+    set_today(monkeypatch, 2024, 1, 23)
+    assert digest.get() == [{"name": "A", "congratulation_date": "2024.01.30"}]
+    assert (digest.hits, digest.misses) == (0, 2)
+
+
+def test_digest_invalidated_when_users_change(monkeypatch):
+    set_today(monkeypatch, 2024, 1, 23)
+    digest = task4.BirthdayDigest([{"name": "A", "birthday": "1990.01.23"}])
+    digest.get()
+    version = digest.version
+    digest.set_users([{"name": "B", "birthday": "1990.01.24"}])
+    assert digest.version == version + 1
+    assert digest.get() == [{"name": "B", "congratulation_date": "2024.01.24"}]
+    assert digest.misses == 2
+
+
+def test_digest_prewarm_for_next_day(monkeypatch):
+    set_today(monkeypatch, 2024, 1, 23)
+    digest = task4.BirthdayDigest(INDEX_USERS)
+    digest.prewarm(_real_date(2024, 1, 24))
+    assert digest.misses == 1
+
+    set_today(monkeypatch, 2024, 1, 24)
+    expected = task4.get_upcoming_birthdays(INDEX_USERS)
+    assert digest.get() == expected
+    assert (digest.hits, digest.misses) == (1, 1)
@@ -1,4 +1,6 @@
+import os
 import sys
+import time
 import pathlib
 import pytest
 
@@ -8,6 +10,7 @@ HW04 = ROOT / "git-pycore-hw-4/task1"
 if str(HW04) not in sys.path:
     sys.path.insert(0, str(HW04))
 
+import task1
 from task1 import total_salary
 
 
@@ -72,3 +75,292 @@ def test_unicode_names_and_utf8(tmp_path: pathlib.Path):
     total, avg = total_salary(str(f))
     assert total == 6000
     assert avg == 3000.0
+
+
+# ------------------ parallel mode: total_salary_parallel ------------------
+
+MIXED_CONTENT = (
+    "\n"
+    "BadLineWithoutComma\n"
+    "John Doe,\n"
+    "Jane,abc\n"
+    "Dev One,1000\n"
+    "Dev Two,2000\n"
+)
+
+
+def make_big_file(p: pathlib.Path, n: int) -> pathlib.Path:
+    lines = []
+    for i in range(n):
+        if i % 17 == 0:
+            lines.append("")
+        elif i % 19 == 0:
+            lines.append(f"Broken{i}")
+        elif i % 23 == 0:
+            lines.append(f"Name {i},")
+        elif i % 29 == 0:
+            lines.append(f"Name {i},n/a")
+        else:
+            lines.append(f"Name {i},{1000 + i % 500}")
+    return write_file(p, "\n".join(lines) + "\n")
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_parallel_matches_sequential(tmp_path: pathlib.Path, workers):
+    f = make_big_file(tmp_path / "big.txt", 20_000)
+    assert task1.total_salary_parallel(str(f), workers=workers) == total_salary(str(f))
+
+
+def test_parallel_applies_same_skip_rules(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "mixed.txt", MIXED_CONTENT)
+    assert task1.total_salary_parallel(str(f), workers=3) == total_salary(str(f))
+
+
+def test_parallel_more_workers_than_lines(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "devs.txt", "Alex Korp,3000\nNikita Borisenko,2000")  # no trailing newline
+    assert task1.total_salary_parallel(str(f), workers=8) == (5000, 2500.0)
+
+
+def test_parallel_empty_and_missing_file(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "empty.txt", "")
+    assert task1.total_salary_parallel(str(f), workers=2) == (0, 0.0)
+    assert task1.total_salary_parallel(str(tmp_path / "nope.txt"), workers=2) == (0, 0.0)
+
+
+def test_parallel_unicode_names_split_safely(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "utf8.txt", "Свят,2500\nВалерія,3500\n" * 1000)
+    assert task1.total_salary_parallel(str(f), workers=4) == (6_000_000, 3000.0)
+
+
+# ------------------ bytes fast path: total_salary_mmap ------------------
+
+def test_mmap_matches_sequential(tmp_path: pathlib.Path):
+    f = make_big_file(tmp_path / "big.txt", 20_000)
+    assert task1.total_salary_mmap(str(f)) == total_salary(str(f))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        MIXED_CONTENT,
+        "A,10\nB,11\nC,11\n",
+        "Свят,2500\nВалерія,3500\n",
+        "A,10\r\nB,20\r\n",
+        "Last,1000",
+        "",
+        "A, 1000 \n",          # whitespace-padded salary
+        "Doe, John,1000\n",    # comma inside the name
+        "A,1000.50\n",         # decimal salary
+        "A,-5\n",              # signed salary
+    ],
+)
+def test_mmap_same_results(tmp_path: pathlib.Path, content):
+    f = write_file(tmp_path / "data.txt", content)
+    assert task1.total_salary_mmap(str(f)) == total_salary(str(f))
+
+
+def test_mmap_missing_file_returns_zeroes(tmp_path: pathlib.Path):
+    assert task1.total_salary_mmap(str(tmp_path / "no_such_file.txt")) == (0, 0.0)
+
+
+def test_mmap_benchmark_generated_file(tmp_path: pathlib.Path):
+    """Benchmark: set SALARY_BENCH_MB=1024 to run on a generated 1 GB file."""
+    size_mb = int(os.environ.get("SALARY_BENCH_MB", "16"))
+    f = tmp_path / "bench.txt"
+    line = b"Sitarama Raju,123456\n"
+    block = line * (1024 * 1024 // len(line))
+    with f.open("wb") as out:
+        for _ in range(size_mb):
+            out.write(block)
+
+    start = time.perf_counter()
+    expected = total_salary(str(f))
+    text_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = task1.total_salary_mmap(str(f))
+    mmap_time = time.perf_counter() - start
+
+    assert result == expected
+    assert mmap_time < text_time, f"mmap: {mmap_time:.3f}s, text: {text_time:.3f}s ({size_mb} MB)"
+
+
+# ------------------ one-pass statistics: salary_stats ------------------
+
+def make_department_file(p: pathlib.Path, n: int) -> pathlib.Path:
+    departments = ["dev", "qa", "ops"]
+    lines = [f"Name {i},{departments[i % 3]},{1 + i}" for i in range(n)]
+    lines += ["", "NoComma", "Empty,dev,", "Bad,qa,abc"]
+    return write_file(p, "\n".join(lines) + "\n")
+
+
+def test_stats_basic_aggregates(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "mixed.txt", MIXED_CONTENT)
+    stats = task1.salary_stats(str(f))
+    assert (stats.total, stats.average) == total_salary(str(f))
+    assert stats.count == 2
+    assert (stats.min, stats.max) == (1000, 2000)
+
+
+def test_stats_quantiles_within_sketch_error(tmp_path: pathlib.Path):
+    f = make_department_file(tmp_path / "dept.txt", 10_000)  # salaries 1..10000
+    stats = task1.salary_stats(str(f))
+    assert stats.count == 10_000
+    assert stats.median == pytest.approx(5000, rel=0.01)
+    assert stats.quantile(0.9) == pytest.approx(9000, rel=0.01)
+    assert stats.quantile(0.99) == pytest.approx(9900, rel=0.01)
+    with pytest.raises(ValueError):
+        stats.quantile(1.5)
+
+
+def test_stats_group_by_key_column(tmp_path: pathlib.Path):
+    f = make_department_file(tmp_path / "dept.txt", 9)  # salaries 1..9
+    stats = task1.salary_stats(str(f), group_column=1)
+    assert stats.groups == {"dev": 1 + 4 + 7, "qa": 2 + 5 + 8, "ops": 3 + 6 + 9}
+
+
+def test_stats_partial_results_merge(tmp_path: pathlib.Path):
+    whole = make_department_file(tmp_path / "whole.txt", 4000)
+    text = whole.read_text(encoding="utf-8").splitlines(keepends=True)
+    a = write_file(tmp_path / "a.txt", "".join(text[:1500]))
+    b = write_file(tmp_path / "b.txt", "".join(text[1500:]))
+
+    expected = task1.salary_stats(str(whole), group_column=1)
+    merged = task1.salary_stats(str(a), group_column=1)
+    merged.merge(task1.salary_stats(str(b), group_column=1))
+    assert (merged.total, merged.count, merged.min, merged.max) == (
+        expected.total, expected.count, expected.min, expected.max
+    )
+    assert merged.groups == expected.groups
+    assert merged.median == pytest.approx(expected.median, rel=0.01)
+
+
+def test_stats_empty_and_missing_file(tmp_path: pathlib.Path):
+    for path in (write_file(tmp_path / "empty.txt", ""), tmp_path / "nope.txt"):
+        stats = task1.salary_stats(str(path))
+        assert (stats.total, stats.count, stats.average) == (0, 0, 0.0)
+        assert stats.min is None and stats.max is None
+        assert stats.groups == {}
+
+
+# ------------------ incremental mode: total_salary_incremental ------------------
+
+def append(p: pathlib.Path, content: str) -> None:
+    with p.open("a", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_incremental_first_run_matches_full(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "ledger.txt", MIXED_CONTENT)
+    assert task1.total_salary_incremental(str(f)) == total_salary(str(f))
+    assert (tmp_path / "ledger.txt.ckpt").exists()
+
+
+def test_incremental_parses_only_appended_bytes(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "ledger.txt", "A,1000\nB,2000\n")
+    assert task1.total_salary_incremental(str(f)) == (3000, 1500.0)
+
+    # Same-size in-place edit of already-processed bytes is not re-read.
+    with f.open("r+b") as fh:
+        fh.write(b"A,9999")
+    append(f, "C,3000\n")
+    assert task1.total_salary_incremental(str(f)) == (6000, 2000.0)
+
+
+def test_incremental_counts_unterminated_last_line(tmp_path: pathlib.Path):
+    # The checkpoint stops at the last newline, but the tail line is still counted.
+    f = write_file(tmp_path / "ledger.txt", "A,1000\nB,20")
+    assert task1.total_salary_incremental(str(f)) == total_salary(str(f))
+    append(f, "00\n")
+    assert task1.total_salary_incremental(str(f)) == total_salary(str(f)) == (3000, 1500.0)
+
+
+def test_incremental_no_trailing_newline_matches_full(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "ledger.txt", "Last,1000")
+    assert task1.total_salary_incremental(str(f)) == total_salary(str(f))
+    assert task1.total_salary_incremental(str(f)) == total_salary(str(f))  # from checkpoint
+
+
+def test_incremental_recomputes_after_truncation(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "ledger.txt", "A,1000\nB,2000\nC,3000\n")
+    task1.total_salary_incremental(str(f))
+    write_file(f, "D,500\n")
+    assert task1.total_salary_incremental(str(f)) == (500, 500.0)
+
+
+def test_incremental_recomputes_when_file_replaced(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "ledger.txt", "A,1000\n")
+    task1.total_salary_incremental(str(f))
+    replacement = write_file(tmp_path / "new.txt", "X,7000\nY,1000\n")
+    os.replace(replacement, f)
+    assert task1.total_salary_incremental(str(f)) == (8000, 4000.0)
+
+
+def test_incremental_custom_checkpoint_and_missing_file(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "ledger.txt", "A,10\nB,11\nC,11\n")
+    ckpt = tmp_path / "state" / "ledger.json"
+    ckpt.parent.mkdir()
+    assert task1.total_salary_incremental(str(f), checkpoint=str(ckpt)) == (32, 10.67)
+    assert ckpt.exists()
+    assert task1.total_salary_incremental(str(tmp_path / "nope.txt")) == (0, 0.0)
+
+
+# ------------------ columnar cache: load_salary_columns ------------------
+
+def test_columns_first_read_writes_cache(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "devs.txt", "Alex Korp,3000\nNikita Borisenko,2000\nSitarama Raju,1000\n")
+    cache_dir = tmp_path / "cache"
+    cols = task1.load_salary_columns(str(f), cache_dir=str(cache_dir))
+    assert not cols.from_cache
+    assert list(cols.names) == ["Alex Korp", "Nikita Borisenko", "Sitarama Raju"]
+    assert list(cols.salaries) == [3000, 2000, 1000]
+    assert any(cache_dir.iterdir())
+
+
+def test_columns_second_read_skips_text_parsing(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "mixed.txt", MIXED_CONTENT)
+    cache_dir = str(tmp_path / "cache")
+    task1.load_salary_columns(str(f), cache_dir=cache_dir)
+    cols = task1.load_salary_columns(str(f), cache_dir=cache_dir)
+    assert cols.from_cache
+    assert list(cols.names) == ["Dev One", "Dev Two"]
+    assert task1.total_salary_cached(str(f), cache_dir=cache_dir) == total_salary(str(f))
+
+
+def test_columns_cache_invalidated_on_append(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "devs.txt", "A,10\nB,11\n")
+    cache_dir = str(tmp_path / "cache")
+    task1.load_salary_columns(str(f), cache_dir=cache_dir)
+    append(f, "C,11\n")
+    cols = task1.load_salary_columns(str(f), cache_dir=cache_dir)
+    assert not cols.from_cache
+    assert task1.total_salary_cached(str(f), cache_dir=cache_dir) == (32, 10.67)
+
+
+def test_columns_cache_invalidated_on_same_size_rewrite(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "devs.txt", "A,10\nB,11\n")
+    cache_dir = str(tmp_path / "cache")
+    task1.load_salary_columns(str(f), cache_dir=cache_dir)
+    size, mtime = f.stat().st_size, f.stat().st_mtime
+
+    write_file(f, "A,90\nB,91\n")
+    os.utime(f, (mtime + 10, mtime + 10))
+    assert f.stat().st_size == size
+
+    cols = task1.load_salary_columns(str(f), cache_dir=cache_dir)
+    assert not cols.from_cache
+    assert list(cols.salaries) == [90, 91]
+
+
+def test_cached_total_with_filter(tmp_path: pathlib.Path):
+    f = write_file(tmp_path / "utf8.txt", "Свят,2500\nВалерія,3500\nОлег,1000\n")
+    cache_dir = str(tmp_path / "cache")
+    assert task1.total_salary_cached(str(f), cache_dir=cache_dir, where=lambda name: name.startswith("В")) == (3500, 3500.0)
+    assert task1.total_salary_cached(str(f), cache_dir=cache_dir) == (7000, 2333.33)
+
+
+def test_cached_total_empty_and_missing_file(tmp_path: pathlib.Path):
+    cache_dir = str(tmp_path / "cache")
+    f = write_file(tmp_path / "empty.txt", "")
+    assert task1.total_salary_cached(str(f), cache_dir=cache_dir) == (0, 0.0)
+    assert task1.total_salary_cached(str(tmp_path / "nope.txt"), cache_dir=cache_dir) == (0, 0.0)